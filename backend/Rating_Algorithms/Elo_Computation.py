@@ -1,6 +1,10 @@
 # %% importing dataset and libraries
 from pathlib import Path
 import os
+import multiprocessing as mp
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 import pandas as pd
 import numpy as np
@@ -29,15 +33,33 @@ _out_visuals_dir.mkdir(parents=True, exist_ok=True)
 games_csv = _data_dir / "games.csv"
 playoffs_csv = _data_dir / "playoffs.csv"
 
-print(f"Using data files from: {games_csv} and {playoffs_csv}")
+# Cleaned intermediate frames are cached here between runs (see _load_or_build)
+_cache_dir = _out_data_dir / "cache"
+_cache_dir.mkdir(parents=True, exist_ok=True)
+
 
-games_original = pd.read_csv(games_csv)
-playoff_games = pd.read_csv(playoffs_csv)
+def _load_or_build(name: str, build, sources: list[Path]) -> pd.DataFrame:
+    """Return the cached frame `name` if it is newer than every source file and this script,
+    otherwise call `build()` and refresh the cache. Pickle keeps dtypes (categoricals,
+    datetimes) intact and needs no extra dependency."""
+    cached = _cache_dir / f"{name}.pkl"
+    deps = [*sources, Path(__file__).resolve()]
+    if cached.exists() and cached.stat().st_mtime > max(p.stat().st_mtime for p in deps):
+        print(f"Loaded cached {name} from {cached}")
+        return pd.read_pickle(cached)
+    df = build()
+    df.to_pickle(cached)
+    return df
+
+print(f"Using data files from: {games_csv} and {playoffs_csv}")
 
 # %% inspecting the columns in each
-common_cols = sorted(set(games_original.columns).intersection(set(playoff_games.columns)))
-only_in_games = sorted(set(games_original.columns) - set(playoff_games.columns))
-only_in_playoffs = sorted(set(playoff_games.columns) - set(games_original.columns))
+# Only the header rows are needed to compare the two schemas
+_games_cols = pd.read_csv(games_csv, nrows=0).columns
+_playoffs_cols = pd.read_csv(playoffs_csv, nrows=0).columns
+common_cols = sorted(set(_games_cols).intersection(set(_playoffs_cols)))
+only_in_games = sorted(set(_games_cols) - set(_playoffs_cols))
+only_in_playoffs = sorted(set(_playoffs_cols) - set(_games_cols))
 
 print(f"Common columns ({len(common_cols)}):")
 print("\n".join(common_cols))
@@ -50,33 +72,45 @@ print("\n".join(only_in_playoffs))
 
 
 # %% Joining the two datasets
-# Keep only the columns common to both datasets, then vertically stack them
-common_cols = sorted(set(games_original.columns).intersection(set(playoff_games.columns)))
-
-# Add IS_PLAYOFF column to distinguish regular season and playoff games
-games_original["IS_PLAYOFF"] = 0
-playoff_games["IS_PLAYOFF"] = 1
-
-playoff_games["WL"] = [0 if x == "L" else 1 for x in playoff_games["WL"]]
-# Restrict each frame to the common columns plus IS_PLAYOFF and concatenate
-games = pd.concat([
-    games_original[common_cols + ["IS_PLAYOFF"]],
-    playoff_games[common_cols + ["IS_PLAYOFF"]]
-], ignore_index=True)
-
-print(f"Joined regular season and playoffs on {len(common_cols)} common columns: {common_cols}")
-print(f"Combined shape: {games.shape}")
-
-# Drop any duplicate rows except for columns that might legitimately differ between duplicates
-# (Adjust the excluded columns list as needed)
-games = games.drop_duplicates()
-
-# %% Ran into duplicates between playoff and normal
-# Sort so that playoff rows come first
-games = games.sort_values("IS_PLAYOFF", ascending=False)
-
-# Drop duplicates ignoring the IS_PLAYOFF column
-games = games.drop_duplicates(subset=[c for c in games.columns if c != "IS_PLAYOFF"], keep="first")
+def load_joined_games(games_csv: Path, playoffs_csv: Path) -> pd.DataFrame:
+    """Load the regular season and playoff CSVs, stack them on their common columns
+    with an IS_PLAYOFF flag, and drop rows duplicated across the two files."""
+    # Narrow the columns the pipeline actually uses and parse dates once at load time.
+    # GAME_ID values (e.g. "0021000008") fit comfortably in int32 and points in int16.
+    read_dtypes = {"GAME_ID": "int32", "PTS": "int16"}
+    games_original = pd.read_csv(games_csv, dtype=read_dtypes,
+                                 parse_dates=["GAME_DATE"], date_format="%Y-%m-%d")
+    playoff_games = pd.read_csv(playoffs_csv, dtype=read_dtypes,
+                                parse_dates=["GAME_DATE"], date_format="%Y-%m-%d")
+
+    # Keep only the columns common to both datasets, then vertically stack them
+    common_cols = sorted(set(games_original.columns).intersection(set(playoff_games.columns)))
+
+    # Add IS_PLAYOFF column to distinguish regular season and playoff games
+    games_original["IS_PLAYOFF"] = np.int8(0)
+    playoff_games["IS_PLAYOFF"] = np.int8(1)
+
+    # Playoff results come as "W"/"L" strings; encode them as 0/1 like the regular season file
+    playoff_games["WL"] = (playoff_games["WL"].to_numpy() != "L").astype(np.int8)
+    # Restrict each frame to the common columns plus IS_PLAYOFF and concatenate
+    games = pd.concat([
+        games_original[common_cols + ["IS_PLAYOFF"]],
+        playoff_games[common_cols + ["IS_PLAYOFF"]]
+    ], ignore_index=True)
+
+    print(f"Joined regular season and playoffs on {len(common_cols)} common columns: {common_cols}")
+    print(f"Combined shape: {games.shape}")
+
+    # Ran into duplicates between playoff and normal: sort so that playoff rows come first
+    games = games.sort_values("IS_PLAYOFF", ascending=False, kind="stable")
+
+    # Drop duplicates ignoring the IS_PLAYOFF column. This also removes exact duplicate rows,
+    # so a separate full-row drop_duplicates pass beforehand is unnecessary.
+    return games.drop_duplicates(subset=[c for c in games.columns if c != "IS_PLAYOFF"], keep="first")
+
+
+games = _load_or_build("games_joined", lambda: load_joined_games(games_csv, playoffs_csv),
+                       [games_csv, playoffs_csv])
 
 # %% Inspecting the data
 def explore_dataframe(df, num_rows=5):
@@ -122,14 +156,14 @@ def summarize_games(df: pd.DataFrame, topk: int = 20) -> None:
     print("\n=== Venue / Home indicators (examples) ===")
     for c in ["MATCHUP", "HOME_TEAM_ID", "VISITOR_TEAM_ID"]:
         if c in df.columns:
-            ex = df[c].dropna().astype(str).head(10).to_list()
+            # Slice before casting so only the ten sampled values are converted to str
+            ex = df[c].dropna().head(10).astype(str).to_list()
             print(f"{c}: {ex}")
 
     # Margin-of-victory summary, if derivable
     if set(["PTS", "GAME_ID", "TEAM_NAME", "WL"]).issubset(df.columns):
-        tmp = df[["GAME_ID", "TEAM_NAME", "PTS", "WL"]].copy()
         margins = (
-            tmp.pivot_table(index="GAME_ID", columns="WL", values="PTS")
+            df.pivot_table(index="GAME_ID", columns="WL", values="PTS")
                .rename(columns={1: "WIN_PTS", 0: "LOSE_PTS"})
         )
         margins["MARGIN"] = margins["WIN_PTS"] - margins["LOSE_PTS"]
@@ -163,61 +197,53 @@ name_map = {
 
 games["TEAM_NAME"] = games["TEAM_NAME"].replace(name_map)
 
-# %% Creating a results DF
-results = []
-
-for game_id, group in games.groupby("GAME_ID"):
-    if len(group) != 2:
-        continue  # skip malformed entries
-
-    # Extract the two rows
-    row1, row2 = group.iloc[0], group.iloc[1]
-
-    if row1["WL"]:
-        win_team = row1["TEAM_NAME"]
-        lose_team = row2["TEAM_NAME"]
-        points_w = row1["PTS"]
-        points_l = row2["PTS"]
-    else:
-        win_team = row2["TEAM_NAME"]
-        lose_team = row1["TEAM_NAME"]
-        points_w = row2["PTS"]
-        points_l = row1["PTS"]
-
-    results.append({
-        "GAME_ID": game_id,
-        "GAME_DATE": row1["GAME_DATE"],  # same for both rows
-        "WIN_TEAM": win_team,
-        "LOSE_TEAM": lose_team,
-        "POINTS_W": points_w,
-        "POINTS_L": points_l
-    })
-
-# Convert to DataFrame
-results_df = pd.DataFrame(results)
+# Encode team names once with a shared categorical dtype: grouping, dedup and merges then work on
+# integer codes, and WIN_TEAM/LOSE_TEAM/HOME_TEAM in results_df inherit the same categories
+team_dtype = pd.CategoricalDtype(sorted(games["TEAM_NAME"].unique()))
+games["TEAM_NAME"] = games["TEAM_NAME"].astype(team_dtype)
 
+# %% Creating a results DF
+def build_results_df(games: pd.DataFrame) -> pd.DataFrame:
+    """Pair the two team rows of every game into one winner/loser row with context
+    signals (HOME_TEAM, IS_PLAYOFF, MARGIN). Games without exactly two rows are skipped."""
+    # Each valid game has exactly two rows: split them into winner and loser frames and join
+    # the two on GAME_ID instead of building a dict per group. Games whose rows are not one
+    # win plus one loss simply fail to match and are dropped with the malformed groups.
+    game_id_counts = games["GAME_ID"].value_counts()
+    paired = games[games["GAME_ID"].map(game_id_counts) == 2]
+    cols = ["GAME_ID", "GAME_DATE", "TEAM_NAME", "PTS"]
+    winners = (paired.loc[paired["WL"] == 1, cols]
+               .sort_values("GAME_ID", kind="stable")
+               .rename(columns={"TEAM_NAME": "WIN_TEAM", "PTS": "POINTS_W"}))
+    losers = (paired.loc[paired["WL"] == 0, ["GAME_ID", "TEAM_NAME", "PTS"]]
+              .rename(columns={"TEAM_NAME": "LOSE_TEAM", "PTS": "POINTS_L"}))
+    results_df = winners.merge(losers, on="GAME_ID", how="inner", validate="one_to_one")
+    results_df = results_df[["GAME_ID", "GAME_DATE", "WIN_TEAM", "LOSE_TEAM", "POINTS_W", "POINTS_L"]]
+
+    # --- Enrich results with context signals for modelling ---
+    # Derive HOME_TEAM from MATCHUP pattern "TEAM vs. OPP" (home is the row containing " vs. ").
+    # One literal substring scan over the whole column; the first marked row per game wins and
+    # games without an explicit marker (some historical rows) are left empty.
+    home_mask = games["MATCHUP"].str.contains(" vs. ", regex=False, na=False)
+    home_by_gid = games.loc[home_mask].drop_duplicates("GAME_ID").set_index("GAME_ID")["TEAM_NAME"]
+
+    # Map IS_PLAYOFF per GAME_ID from the joined table (consistent within a game)
+    is_po_by_gid = games.drop_duplicates("GAME_ID").set_index("GAME_ID")["IS_PLAYOFF"]
+
+    results_df["HOME_TEAM"] = results_df["GAME_ID"].map(home_by_gid)
+    results_df["IS_PLAYOFF"] = results_df["GAME_ID"].map(is_po_by_gid).fillna(0).astype(int)
+    results_df["MARGIN"] = results_df["POINTS_W"] - results_df["POINTS_L"]
+    return results_df
+
+
+results_df = _load_or_build("results_enriched", lambda: build_results_df(games), [games_csv, playoffs_csv])
 print(results_df.head())
 
-# --- Enrich results with context signals for modelling ---
-# Derive HOME_TEAM from MATCHUP pattern "TEAM vs. OPP" (home is the row containing " vs. ")
-_home_by_gid = {}
-for gid, grp in games.groupby("GAME_ID"):
-    # Prefer explicit " vs. " marker
-    home_row = grp[grp["MATCHUP"].astype(str).str.contains(" vs. ")]
-    if not home_row.empty:
-        _home_by_gid[gid] = home_row.iloc[0]["TEAM_NAME"]
-    else:
-        # Fallback: if no explicit marker, leave as None (some historical rows)
-        _home_by_gid[gid] = None
-
-# Map IS_PLAYOFF per GAME_ID from the joined table (consistent within a game)
-_is_po_by_gid = games.drop_duplicates("GAME_ID").set_index("GAME_ID")["IS_PLAYOFF"].to_dict()
+# %% Rating engine abstraction
+# Shared Elo logistic constant: 10 ** (x / 400) == exp(x * _LN10_OVER_400)
+_LN10_OVER_400 = math.log(10.0) / 400.0
 
-results_df["HOME_TEAM"] = results_df["GAME_ID"].map(_home_by_gid)
-results_df["IS_PLAYOFF"] = results_df["GAME_ID"].map(_is_po_by_gid).fillna(0).astype(int)
-results_df["MARGIN"] = results_df["POINTS_W"] - results_df["POINTS_L"]
 
-# %% Rating engine abstraction
 class RatingEngine(ABC):
     """Abstract base class for rating engines."""
 
@@ -237,44 +263,157 @@ class RatingEngine(ABC):
 
     def expected_score(self, rating_a: float, rating_b: float, rd_a: float | None = None, rd_b: float | None = None) -> float:
         """Return P(A beats B) using the engine's model. Default: Elo-style logistic."""
-        # Elo logistic with scale 400
-        return 1.0 / (1.0 + 10 ** (-(rating_a - rating_b) / 400.0))
+        # Elo logistic with scale 400: 10**(x/400) == exp(x * ln(10)/400)
+        return 1.0 / (1.0 + math.exp((rating_b - rating_a) * _LN10_OVER_400))
 
     def win_prob(self, rating_a: float, rating_b: float, rd_a: float | None = None, rd_b: float | None = None) -> float:
         """Convenience wrapper: P(A beats B). Engines may override for custom formulas."""
         return self.expected_score(rating_a, rating_b, rd_a, rd_b)
 
+    def win_prob_batch(self, rating_a: np.ndarray, rating_b: np.ndarray,
+                       rd_a: np.ndarray | None = None, rd_b: np.ndarray | None = None) -> np.ndarray:
+        """Vectorised win_prob over arrays of pre-game ratings (NaN rd means unknown).
+        Default: the Elo-style logistic from expected_score as one NumPy expression."""
+        rating_a = np.asarray(rating_a, dtype=np.float64)
+        rating_b = np.asarray(rating_b, dtype=np.float64)
+        return 1.0 / (1.0 + np.exp((rating_b - rating_a) * _LN10_OVER_400))
+
     def record_game_ctx(self, winner: str, loser: str, game_date: pd.Timestamp, **ctx) -> None:
         """Optional context-aware update. Defaults to classic record_game for compatibility."""
         return self.record_game(winner, loser, game_date)
 
+    def _init_teams(self, teams=None) -> None:
+        """Set up the team name -> integer code map, optionally seeded in a fixed order
+        (e.g. the categories of the games' team Categorical) so codes line up with it."""
+        self._codes: dict[str, int] = {}
+        for name in (teams if teams is not None else []):
+            self._code(name)
+
+    def _code(self, name: str) -> int:
+        """Integer code of a team; new names are registered and state arrays grown to fit."""
+        code = self._codes.get(name)
+        if code is None:
+            code = len(self._codes)
+            self._codes[name] = code
+            self._grow_state(code + 1)
+        return code
+
+    def _grow_state(self, n_teams: int) -> None:
+        """Ensure per-team state holds at least `n_teams` entries. Array-backed engines override."""
+        pass
+
+    def _init_history(self, n_games: int = 0) -> None:
+        """Preallocate columnar snapshot buffers: two post-game rows per game."""
+        cap = 2 * n_games
+        self._hist_dates = np.empty(cap, dtype="datetime64[ns]")
+        self._hist_teams = np.empty(cap, dtype=object)
+        self._hist_ratings = np.empty(cap, dtype=np.float64)
+        self._pos = 0
+
+    def _reserve(self, rows: int) -> int:
+        """Make room for `rows` more snapshots and return the write position.
+        Buffers only grow when more games arrive than were preallocated for."""
+        if not hasattr(self, "_pos"):
+            self._init_history()
+        need = self._pos + rows
+        if need > len(self._hist_dates):
+            cap = max(need, 2 * len(self._hist_dates), 64)
+            for attr in ("_hist_dates", "_hist_teams", "_hist_ratings"):
+                old = getattr(self, attr)
+                new = np.empty(cap, dtype=old.dtype)
+                new[:self._pos] = old[:self._pos]
+                setattr(self, attr, new)
+        return self._pos
+
+    def _record_pair(self, game_date, winner: str, winner_rating: float, loser: str, loser_rating: float) -> None:
+        """Write the post-game snapshots of both teams."""
+        i = self._reserve(2)
+        self._hist_dates[i] = game_date
+        self._hist_teams[i] = winner
+        self._hist_ratings[i] = winner_rating
+        self._hist_dates[i + 1] = game_date
+        self._hist_teams[i + 1] = loser
+        self._hist_ratings[i + 1] = loser_rating
+        self._pos = i + 2
+
+    def _record_batch(self, dates: np.ndarray, win_idx: np.ndarray, lose_idx: np.ndarray,
+                      win_ratings, lose_ratings) -> None:
+        """Write the post-game snapshots of a whole batch of games at once, given this engine's
+        team codes and per-game winner/loser ratings. Rows interleave winner then loser per game."""
+        n = len(win_idx)
+        start = self._reserve(2 * n)
+        stop = start + 2 * n
+        names = np.empty(len(self._codes), dtype=object)
+        names[list(self._codes.values())] = list(self._codes.keys())
+        self._hist_dates[start:stop] = np.repeat(dates, 2)
+        self._hist_teams[start:stop] = names[np.column_stack([win_idx, lose_idx]).ravel()]
+        self._hist_ratings[start:stop] = np.column_stack([win_ratings, lose_ratings]).ravel()
+        self._pos = stop
+
+    def history_df(self) -> pd.DataFrame:
+        """Return the rating snapshots as a GAME_DATE/TEAM/RATING DataFrame."""
+        n = self._reserve(0)
+        return pd.DataFrame({
+            "GAME_DATE": self._hist_dates[:n],
+            "TEAM": self._hist_teams[:n],
+            "RATING": self._hist_ratings[:n],
+        })
+
     @property
     def history(self) -> list[dict]:
-        """Time-stamped rating snapshots appended by concrete engines."""
-        if not hasattr(self, "_history"):
-            self._history = []
-        return self._history
+        """Time-stamped rating snapshots recorded by concrete engines."""
+        return self.history_df().to_dict("records")
+
+
+def _grow(arr: np.ndarray, n: int, fill: float) -> np.ndarray:
+    """Return `arr` extended with `fill` to at least length n (doubling to amortise growth)."""
+    if len(arr) >= n:
+        return arr
+    cap = max(n, 2 * len(arr), 8)
+    return np.concatenate([arr, np.full(cap - len(arr), fill, dtype=arr.dtype)])
 
 
 #
 # Helper: Glicko expected score (A vs B) using opponent RD
+# Constants of the Glicko g(RD) factor, computed once at import
+_GLICKO_Q = _LN10_OVER_400
+_GLICKO_3Q2_OVER_PI2 = 3.0 * _GLICKO_Q * _GLICKO_Q / (math.pi * math.pi)
+
+
 def glicko_expected_score(rating_a: float, rating_b: float, rd_b: float) -> float:
     """Calculate expected score of player A against player B using Glicko formula."""
-    q = math.log(10) / 400.0
-    g = 1.0 / math.sqrt(1.0 + 3.0 * (q ** 2) * (rd_b ** 2) / (math.pi ** 2))
-    return 1.0 / (1.0 + 10.0 ** (-g * (rating_a - rating_b) / 400.0))
+    g = 1.0 / math.sqrt(1.0 + _GLICKO_3Q2_OVER_PI2 * rd_b * rd_b)
+    return 1.0 / (1.0 + math.exp(-g * (rating_a - rating_b) * _GLICKO_Q))
+
+
+def glicko_expected_score_batch(rating_a, rating_b, rd_b) -> np.ndarray:
+    """Vectorised glicko_expected_score over arrays (or broadcastable scalars) of matchups."""
+    rating_a = np.asarray(rating_a, dtype=np.float64)
+    rating_b = np.asarray(rating_b, dtype=np.float64)
+    rd_b = np.asarray(rd_b, dtype=np.float64)
+    g = 1.0 / np.sqrt(1.0 + _GLICKO_3Q2_OVER_PI2 * rd_b * rd_b)
+    return 1.0 / (1.0 + np.exp(-g * (rating_a - rating_b) * _GLICKO_Q))
+
 
 class GlickoEngine(RatingEngine):
     """Glicko-2 rating engine implementation using the `glicko2` library."""
 
-    def __init__(self):
-        self.players: dict[str, Player] = {}
-        self._history: list[dict] = []
+    def __init__(self, n_games: int = 0, teams=None):
+        # One glicko2.Player per team, indexed by the engine's integer team code
+        self._players: list[Player] = []
+        self._init_teams(teams)
+        self._init_history(n_games)
+
+    def _grow_state(self, n_teams: int) -> None:
+        while len(self._players) < n_teams:
+            self._players.append(Player())
+
+    @property
+    def players(self) -> dict[str, Player]:
+        return {name: self._players[code] for name, code in self._codes.items()}
 
     def _get_player(self, name: str) -> Player:
-        if name not in self.players:
-            self.players[name] = Player()
-        return self.players[name]
+        return self._players[self._code(name)]
 
     def record_game(self, winner: str, loser: str, game_date: pd.Timestamp) -> None:
         w = self._get_player(winner)
@@ -283,16 +422,7 @@ class GlickoEngine(RatingEngine):
         w.update_player([l.getRating()], [l.getRd()], [1])
         l.update_player([w.getRating()], [w.getRd()], [0])
         # Snapshot after the game
-        self._history.append({
-            "GAME_DATE": game_date,
-            "TEAM": winner,
-            "RATING": w.getRating(),
-        })
-        self._history.append({
-            "GAME_DATE": game_date,
-            "TEAM": loser,
-            "RATING": l.getRating(),
-        })
+        self._record_pair(game_date, winner, w.getRating(), loser, l.getRating())
 
     def get_rating(self, team: str) -> float:
         return self._get_player(team).getRating()
@@ -306,34 +436,87 @@ class GlickoEngine(RatingEngine):
             rd_b = 50.0
         return glicko_expected_score(rating_a, rating_b, rd_b)
 
+    def win_prob_batch(self, rating_a: np.ndarray, rating_b: np.ndarray,
+                       rd_a: np.ndarray | None = None, rd_b: np.ndarray | None = None) -> np.ndarray:
+        rating_b = np.asarray(rating_b, dtype=np.float64)
+        rd_b = np.full(rating_b.shape, 50.0) if rd_b is None else np.where(np.isnan(rd_b), 50.0, rd_b)
+        return glicko_expected_score_batch(rating_a, rating_b, rd_b)
+
 
 
 class EloEngine(RatingEngine):
     """Classic Elo rating engine."""
 
-    def __init__(self, k_factor: float = 32.0, init_rating: float = 1500.0):
+    def __init__(self, k_factor: float = 32.0, init_rating: float = 1500.0, n_games: int = 0, teams=None):
         self.k = k_factor
         self.init = init_rating
-        self.ratings: dict[str, float] = {}
-        self._history: list[dict] = []
+        self._r = np.empty(0, dtype=np.float64)
+        self._init_teams(teams)
+        self._init_history(n_games)
+
+    def _grow_state(self, n_teams: int) -> None:
+        self._r = _grow(self._r, n_teams, self.init)
+
+    @property
+    def ratings(self) -> dict[str, float]:
+        """Current rating per team name."""
+        return {name: float(self._r[code]) for name, code in self._codes.items()}
 
     def _get_rating(self, name: str) -> float:
-        return self.ratings.get(name, self.init)
+        code = self._code(name)
+        return float(self._r[code])
 
     def get_rating(self, team: str) -> float:
         return self._get_rating(team)
 
     def record_game(self, winner: str, loser: str, game_date: pd.Timestamp) -> None:
-        Ra = self._get_rating(winner)
-        Rb = self._get_rating(loser)
-        Ea = 1.0 / (1.0 + 10 ** ((Rb - Ra) / 400.0))
-        Eb = 1.0 / (1.0 + 10 ** ((Ra - Rb) / 400.0))
-        Ra_new = Ra + self.k * (1 - Ea)
-        Rb_new = Rb + self.k * (0 - Eb)
-        self.ratings[winner] = Ra_new
-        self.ratings[loser] = Rb_new
-        self._history.append({"GAME_DATE": game_date, "TEAM": winner, "RATING": Ra_new})
-        self._history.append({"GAME_DATE": game_date, "TEAM": loser, "RATING": Rb_new})
+        wi = self._code(winner)
+        li = self._code(loser)
+        Ra = float(self._r[wi])
+        Rb = float(self._r[li])
+        Ea = 1.0 / (1.0 + math.exp((Rb - Ra) * _LN10_OVER_400))
+        # Eb == 1 - Ea, so the loser moves by exactly the winner's gain
+        delta = self.k * (1.0 - Ea)
+        Ra_new = Ra + delta
+        Rb_new = Rb - delta
+        self._r[wi] = Ra_new
+        self._r[li] = Rb_new
+        self._record_pair(game_date, winner, Ra_new, loser, Rb_new)
+
+    def record_games_vec(self, win_idx: np.ndarray, lose_idx: np.ndarray, dates: np.ndarray,
+                         teams, ctx: dict[str, np.ndarray] | None = None) -> np.ndarray:
+        """Replay a chronological batch of games given integer team codes into `teams`.
+        Classic Elo ignores the per-game context arrays in `ctx`.
+        Codes are translated to this engine's own codes once. The sequential update runs over
+        plain Python lists/floats (no per-element NumPy scalar boxing) with the constants and
+        math.exp hoisted into locals; per-game winner/loser ratings are written in one batch.
+        Returns the pre-game P(winner beats loser) per game.
+        """
+        n = len(win_idx)
+        codes = np.array([self._code(t) for t in teams], dtype=np.intp)
+        win_idx = codes[win_idx]
+        lose_idx = codes[lose_idx]
+        ratings = self._r.tolist()
+        p_win = [0.0] * n
+        out_w = [0.0] * n
+        out_l = [0.0] * n
+        k = float(self.k)
+        c = _LN10_OVER_400
+        exp = math.exp
+        for i, (w, l) in enumerate(zip(win_idx.tolist(), lose_idx.tolist())):
+            Ra = ratings[w]
+            Rb = ratings[l]
+            Ea = 1.0 / (1.0 + exp((Rb - Ra) * c))
+            delta = k * (1.0 - Ea)
+            ratings[w] = Ra + delta
+            ratings[l] = Rb - delta
+            p_win[i] = Ea
+            out_w[i] = Ra + delta
+            out_l[i] = Rb - delta
+        self._r[:] = ratings
+
+        self._record_batch(dates, win_idx, lose_idx, out_w, out_l)
+        return np.asarray(p_win, dtype=np.float64)
 
     # expected_score uses default Elo logistic from base class
 
@@ -344,31 +527,43 @@ class MarginHomeElo(RatingEngine):
     Uses context passed via record_game_ctx; falls back gracefully when missing.
     """
     def __init__(self, k_base: float = 20.0, init_rating: float = 1500.0,
-                 home_adv: float = 60.0, playoff_k_boost: float = 1.25):
+                 home_adv: float = 60.0, playoff_k_boost: float = 1.25, n_games: int = 0, teams=None):
         self.k_base = k_base
         self.init = init_rating
         self.home_adv = home_adv
         self.playoff_k_boost = playoff_k_boost
-        self.ratings: dict[str, float] = {}
-        self._history: list[dict] = []
+        self._r = np.empty(0, dtype=np.float64)
+        self._init_teams(teams)
+        self._init_history(n_games)
+
+    def _grow_state(self, n_teams: int) -> None:
+        self._r = _grow(self._r, n_teams, self.init)
+
+    @property
+    def ratings(self) -> dict[str, float]:
+        """Current rating per team name."""
+        return {name: float(self._r[code]) for name, code in self._codes.items()}
 
     def _get(self, name: str) -> float:
-        return self.ratings.get(name, self.init)
+        code = self._code(name)
+        return float(self._r[code])
 
     def get_rating(self, team: str) -> float:
         return self._get(team)
 
     def record_game(self, winner: str, loser: str, game_date: pd.Timestamp) -> None:
         # Backward-compat path with no context: classic Elo update
-        Ra = self._get(winner)
-        Rb = self._get(loser)
-        Ea = 1.0 / (1.0 + 10 ** ((Rb - Ra) / 400.0))
-        Ra_new = Ra + self.k_base * (1 - Ea)
-        Rb_new = Rb + self.k_base * (0 - (1 - Ea))
-        self.ratings[winner] = Ra_new
-        self.ratings[loser] = Rb_new
-        self._history.append({"GAME_DATE": game_date, "TEAM": winner, "RATING": Ra_new})
-        self._history.append({"GAME_DATE": game_date, "TEAM": loser, "RATING": Rb_new})
+        wi = self._code(winner)
+        li = self._code(loser)
+        Ra = float(self._r[wi])
+        Rb = float(self._r[li])
+        Ea = 1.0 / (1.0 + math.exp((Rb - Ra) * _LN10_OVER_400))
+        delta = self.k_base * (1 - Ea)
+        Ra_new = Ra + delta
+        Rb_new = Rb - delta
+        self._r[wi] = Ra_new
+        self._r[li] = Rb_new
+        self._record_pair(game_date, winner, Ra_new, loser, Rb_new)
 
     def record_game_ctx(self, winner: str, loser: str, game_date: pd.Timestamp, **ctx) -> None:
         # Context-aware update using margin, home team and playoff flag when available
@@ -376,8 +571,10 @@ class MarginHomeElo(RatingEngine):
         home_team = ctx.get("home_team")
         is_playoff = int(ctx.get("is_playoff", 0))
 
-        Ra = self._get(winner)
-        Rb = self._get(loser)
+        wi = self._code(winner)
+        li = self._code(loser)
+        Ra = float(self._r[wi])
+        Rb = float(self._r[li])
 
         # Apply home advantage to pregame rating gap
         gap = Ra - Rb
@@ -388,7 +585,7 @@ class MarginHomeElo(RatingEngine):
                 gap -= self.home_adv
 
         # Expected score based on adjusted gap
-        Ea = 1.0 / (1.0 + 10 ** (-gap / 400.0))
+        Ea = 1.0 / (1.0 + math.exp(-gap * _LN10_OVER_400))
 
         # Margin multiplier: log form used in many Elo variants
         if margin is None or margin <= 0:
@@ -399,38 +596,173 @@ class MarginHomeElo(RatingEngine):
         # Playoff boost to K
         k = self.k_base * (self.playoff_k_boost if is_playoff else 1.0)
 
-        Ra_new = Ra + k * mult * (1 - Ea)
-        Rb_new = Rb + k * mult * (0 - (1 - Ea))
-
-        self.ratings[winner] = Ra_new
-        self.ratings[loser] = Rb_new
-        self._history.append({"GAME_DATE": game_date, "TEAM": winner, "RATING": Ra_new})
-        self._history.append({"GAME_DATE": game_date, "TEAM": loser, "RATING": Rb_new})
+        # Zero-sum update: the loser gives up exactly what the winner gains (Eb == 1 - Ea)
+        delta = k * mult * (1 - Ea)
+        Ra_new = Ra + delta
+        Rb_new = Rb - delta
+
+        self._r[wi] = Ra_new
+        self._r[li] = Rb_new
+        self._record_pair(game_date, winner, Ra_new, loser, Rb_new)
+
+    def record_games_vec(self, win_idx: np.ndarray, lose_idx: np.ndarray, dates: np.ndarray,
+                         teams, ctx: dict[str, np.ndarray] | None = None) -> np.ndarray:
+        """Batched record_game_ctx over integer team codes into `teams`, mirroring EloEngine.
+        `ctx` holds per-game arrays: "home_sign" (+1 winner at home, -1 loser at home, 0 unknown),
+        "margin" and "is_playoff". Missing arrays fall back to no home edge, no margin multiplier
+        and regular-season K. Returns the pre-game P(winner beats loser) per game, which like
+        win_prob uses the plain rating gap without home advantage.
+        """
+        n = len(win_idx)
+        ctx = ctx or {}
+        codes = np.array([self._code(t) for t in teams], dtype=np.intp)
+        win_idx = codes[win_idx]
+        lose_idx = codes[lose_idx]
+        home_sign = ctx.get("home_sign", np.zeros(n, dtype=np.int8))
+        margins = ctx.get("margin", np.zeros(n))
+        is_playoff = ctx.get("is_playoff", np.zeros(n, dtype=np.int8))
+
+        ratings = self._r.tolist()
+        pre_w = [0.0] * n
+        pre_l = [0.0] * n
+        out_w = [0.0] * n
+        out_l = [0.0] * n
+        home_adv = float(self.home_adv)
+        k_regular = self.k_base * 1.0
+        k_playoff = self.k_base * self.playoff_k_boost
+        c = _LN10_OVER_400
+        exp = math.exp
+        log = math.log
+        rows = zip(win_idx.tolist(), lose_idx.tolist(), np.asarray(home_sign).tolist(),
+                   np.asarray(margins, dtype=np.float64).tolist(), np.asarray(is_playoff).tolist())
+        for i, (w, l, home, margin, po) in enumerate(rows):
+            Ra = ratings[w]
+            Rb = ratings[l]
+            pre_w[i] = Ra
+            pre_l[i] = Rb
+
+            # Same arithmetic as record_game_ctx so both paths produce identical ratings
+            gap = Ra - Rb
+            if home > 0:
+                gap += home_adv
+            elif home < 0:
+                gap -= home_adv
+            Ea = 1.0 / (1.0 + exp(-gap * c))
+            mult = 1.0 if margin <= 0 else log(1.0 + margin)
+            k = k_playoff if po else k_regular
+            delta = k * mult * (1 - Ea)
+            ratings[w] = Ra + delta
+            ratings[l] = Rb - delta
+            out_w[i] = Ra + delta
+            out_l[i] = Rb - delta
+        self._r[:] = ratings
+
+        self._record_batch(dates, win_idx, lose_idx, out_w, out_l)
+        return self.win_prob_batch(pre_w, pre_l)
+
+
+def _erf(x) -> np.ndarray:
+    """math.erf over a float64 array. NumPy has no erf and scipy is not a dependency, so
+    this is still a Python-level call per element; it keeps batch probabilities equal
+    to the scalar win_prob rather than switching to an approximation."""
+    x = np.asarray(x, dtype=np.float64)
+    return np.fromiter(map(math.erf, x.ravel().tolist()), dtype=np.float64, count=x.size).reshape(x.shape)
 
 
 class TrueSkillEngine(RatingEngine):
     """TrueSkill rating engine (mu used as scalar rating; sigma as uncertainty)."""
 
-    def __init__(self, mu: float = 25.0, sigma: float = 25.0/3.0, beta: float = 25.0/6.0, tau: float = 25.0/300.0, draw_probability: float = 0.0):
+    def __init__(self, mu: float = 25.0, sigma: float = 25.0/3.0, beta: float = 25.0/6.0, tau: float = 25.0/300.0, draw_probability: float = 0.0,
+                 n_games: int = 0, teams=None):
         # Configure a private environment so we don't mutate globals elsewhere
-        self.env = ts.TrueSkill(mu=mu, sigma=sigma, beta=beta, tau=tau, draw_probability=draw_probability)
-        self.players: dict[str, ts.Rating] = {}
-        self._history: list[dict] = []
+        self._env_params = dict(mu=mu, sigma=sigma, beta=beta, tau=tau, draw_probability=draw_probability)
+        self.env = ts.TrueSkill(**self._env_params)
+        self._players: list[ts.Rating] = []
+        self._init_teams(teams)
+        self._init_history(n_games)
+
+    def __getstate__(self):
+        # The TrueSkill environment holds local closures that cannot be pickled; rebuild it instead
+        state = self.__dict__.copy()
+        del state["env"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.env = ts.TrueSkill(**self._env_params)
+
+    def _grow_state(self, n_teams: int) -> None:
+        while len(self._players) < n_teams:
+            self._players.append(self.env.create_rating())
+
+    @property
+    def players(self) -> dict[str, ts.Rating]:
+        """Current TrueSkill rating per team name."""
+        return {name: self._players[code] for name, code in self._codes.items()}
 
     def _get_player(self, name: str) -> ts.Rating:
-        if name not in self.players:
-            self.players[name] = self.env.create_rating()
-        return self.players[name]
+        return self._players[self._code(name)]
 
     def record_game(self, winner: str, loser: str, game_date: pd.Timestamp) -> None:
-        w = self._get_player(winner)
-        l = self._get_player(loser)
-        w_new, l_new = self.env.rate_1vs1(w, l)
-        self.players[winner] = w_new
-        self.players[loser] = l_new
+        wi = self._code(winner)
+        li = self._code(loser)
+        w_new, l_new = self.env.rate_1vs1(self._players[wi], self._players[li])
+        self._players[wi] = w_new
+        self._players[li] = l_new
         # Store mu as scalar rating for plotting/exports
-        self._history.append({"GAME_DATE": game_date, "TEAM": winner, "RATING": w_new.mu})
-        self._history.append({"GAME_DATE": game_date, "TEAM": loser, "RATING": l_new.mu})
+        self._record_pair(game_date, winner, w_new.mu, loser, l_new.mu)
+
+    def record_games_vec(self, win_idx: np.ndarray, lose_idx: np.ndarray, dates: np.ndarray,
+                         teams, ctx: dict[str, np.ndarray] | None = None) -> np.ndarray:
+        """Batched record_game over integer team codes into `teams`, mirroring EloEngine.
+        A 1-vs-1 game without draws needs no factor-graph iteration, so each update is the
+        closed form: apply tau, then shift mu by v and shrink sigma by w of the truncated
+        performance gap (the same env.v_win/w_win rate_1vs1 evaluates), without building graph
+        and Rating objects per game. TrueSkill ignores `ctx`.
+        Returns the pre-game P(winner beats loser) per game from the pre-game mu and sigma.
+        """
+        n = len(win_idx)
+        codes = np.array([self._code(t) for t in teams], dtype=np.intp)
+        win_idx = codes[win_idx]
+        lose_idx = codes[lose_idx]
+        mus = [float(p.mu) for p in self._players]
+        sigmas = [float(p.sigma) for p in self._players]
+        pre = [[0.0] * n for _ in range(4)]
+        pre_w, pre_l, pre_sw, pre_sl = pre
+        out_w = [0.0] * n
+        out_l = [0.0] * n
+        env = self.env
+        v_win = env.v_win
+        w_win = env.w_win
+        tau2 = env.tau ** 2
+        two_beta2 = 2 * env.beta ** 2
+        draw_margin = ts.calc_draw_margin(env.draw_probability, 2, env=env)
+        sqrt = math.sqrt
+        for i, (w, l) in enumerate(zip(win_idx.tolist(), lose_idx.tolist())):
+            mu_w = mus[w]
+            mu_l = mus[l]
+            pre_w[i] = mu_w
+            pre_l[i] = mu_l
+            pre_sw[i] = sigmas[w]
+            pre_sl[i] = sigmas[l]
+
+            var_w = sigmas[w] ** 2 + tau2
+            var_l = sigmas[l] ** 2 + tau2
+            c2 = two_beta2 + var_w + var_l
+            c = sqrt(c2)
+            t = (mu_w - mu_l) / c
+            v = v_win(t, draw_margin / c)
+            wf = w_win(t, draw_margin / c)
+            mus[w] = mu_w + var_w / c * v
+            mus[l] = mu_l - var_l / c * v
+            sigmas[w] = sqrt(var_w * (1.0 - var_w / c2 * wf))
+            sigmas[l] = sqrt(var_l * (1.0 - var_l / c2 * wf))
+            out_w[i] = mus[w]
+            out_l[i] = mus[l]
+        self._players = [env.create_rating(mu=m, sigma=sd) for m, sd in zip(mus, sigmas)]
+
+        self._record_batch(dates, win_idx, lose_idx, out_w, out_l)
+        return self.win_prob_batch(*(np.asarray(col, dtype=np.float64) for col in pre))
 
     def get_rating(self, team: str) -> float:
         return float(self._get_player(team).mu)
@@ -456,142 +788,315 @@ class TrueSkillEngine(RatingEngine):
         # Standard normal CDF via erf
         return 0.5 * (1.0 + math.erf(z / math.sqrt(2.0)))
 
+    def win_prob_batch(self, rating_a: np.ndarray, rating_b: np.ndarray,
+                       rd_a: np.ndarray | None = None, rd_b: np.ndarray | None = None) -> np.ndarray:
+        rating_a = np.asarray(rating_a, dtype=np.float64)
+        rating_b = np.asarray(rating_b, dtype=np.float64)
+        sigma_a = np.full(rating_a.shape, self.env.sigma) if rd_a is None else np.where(np.isnan(rd_a), self.env.sigma, rd_a)
+        sigma_b = np.full(rating_b.shape, self.env.sigma) if rd_b is None else np.where(np.isnan(rd_b), self.env.sigma, rd_b)
+        denom = np.sqrt(2 * (self.env.beta ** 2) + sigma_a ** 2 + sigma_b ** 2)
+        z = (rating_a - rating_b) / denom
+        # Standard normal CDF via erf (per element, see _erf)
+        return 0.5 * (1.0 + _erf(z / math.sqrt(2.0)))
+
 # %% Engine-driven rating computation for multiple engines
-# Ensure proper date format and sort
-results_df["GAME_DATE"] = pd.to_datetime(results_df["GAME_DATE"])
+# GAME_DATE is already datetime64 from the CSV load; just sort chronologically
 results_df = results_df.sort_values(by="GAME_DATE").reset_index(drop=True)
 
+# Integer-code every team once so array-backed engines can index state directly
+# (the team columns share one categorical dtype, so the categorical codes are those indices)
+team_names = results_df["WIN_TEAM"].cat.categories
+win_codes = results_df["WIN_TEAM"].cat.codes.to_numpy(dtype=np.intp)
+lose_codes = results_df["LOSE_TEAM"].cat.codes.to_numpy(dtype=np.intp)
+
+# Engines preallocate snapshot buffers for every game up front and share the team coding
 ENGINES_TO_RUN = [
-    ("elo",       lambda: EloEngine(k_factor=32.0, init_rating=1500.0)),
-    ("glicko",    lambda: GlickoEngine()),
-    ("trueskill", lambda: TrueSkillEngine()),
-    ("margin_home_elo", lambda: MarginHomeElo()),
+    ("elo",       lambda: EloEngine(k_factor=32.0, init_rating=1500.0, n_games=len(results_df), teams=team_names)),
+    ("glicko",    lambda: GlickoEngine(n_games=len(results_df), teams=team_names)),
+    ("trueskill", lambda: TrueSkillEngine(n_games=len(results_df), teams=team_names)),
+    ("margin_home_elo", lambda: MarginHomeElo(n_games=len(results_df), teams=team_names)),
 ]
 
+# The API serves the dense daily panel (ratings_{engine}.csv). Set to False to export only the
+# sparse post-game snapshots (ratings_{engine}_snapshots.csv) and skip the date x team expansion.
+EXPORT_DENSE_PANEL = True
 
-def run_engine(engine_name: str, factory) -> pd.DataFrame:
-    """Run an engine through all matches, save CSV and plot, and return the full_ratings DataFrame."""
-    engine: RatingEngine = factory()
+# The CSVs are the pipeline's real output; the PNGs are only for eyeballing the runs.
+# Set SAVE_PLOTS to False to skip rendering, and PLOT_DPI sets the saved image resolution.
+SAVE_PLOTS = True
+PLOT_DPI = 150
+
+
+# Post-game snapshot rows (GAME_DATE, TEAM, RATING) per engine, filled by run_engine
+engine_snapshots: dict[str, pd.DataFrame] = {}
+# Forward-filled date x team rating panels per engine, filled by export_engine for plotting
+engine_panels: dict[str, pd.DataFrame] = {}
 
-    # Process each game in chronological order via the engine
-    # Also compute pre-game prediction correctness for this engine
-    pred_correct_flags = []
-    for _, row in results_df.iterrows():
-        win = row["WIN_TEAM"]
-        lose = row["LOSE_TEAM"]
-        gdate = row["GAME_DATE"]
-
-        # Get current ratings (before updating) and uncertainties (if available)
-        r_win = float(engine.get_rating(win))
-        r_lose = float(engine.get_rating(lose))
-        try:
-            rd_win = engine.get_uncertainty(win)
-        except Exception:
-            rd_win = None
-        try:
-            rd_lose = engine.get_uncertainty(lose)
-        except Exception:
-            rd_lose = None
-
-        # Predict probability that the actual winner beats the loser BEFORE the update
-        p_win = engine.win_prob(r_win, r_lose, rd_win, rd_lose)
-        pred_correct_flags.append(1 if p_win >= 0.5 else 0)
-
-        # Now update the engine with the actual result, passing context when supported
-        ctx = {
-            "home_team": row.get("HOME_TEAM", None),
-            "margin": row.get("MARGIN", None),
-            "is_playoff": row.get("IS_PLAYOFF", 0),
-        }
-        if hasattr(engine, "record_game_ctx"):
-            engine.record_game_ctx(win, lose, gdate, **ctx)
-        else:
-            engine.record_game(win, lose, gdate)
 
+def build_team_ratings(ratings_df: pd.DataFrame) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+    """Index snapshot rows as {team: (sorted dates, ratings)} for binary-search lookups.
+    Ratings only change on game days, so this is far smaller than the daily panel."""
+    ordered = ratings_df.sort_values("GAME_DATE", kind="stable")
+    return {
+        team: (grp["GAME_DATE"].to_numpy(dtype="datetime64[ns]"), grp["RATING"].to_numpy(dtype=np.float64))
+        for team, grp in ordered.groupby("TEAM", sort=False)
+    }
+
+
+def rating_on_or_before(team_ratings: dict[str, tuple[np.ndarray, np.ndarray]], team: str,
+                        date: pd.Timestamp) -> float | None:
+    """Return the team's latest snapshot rating on or before `date`, or None if it has none yet."""
+    entry = team_ratings.get(team)
+    if entry is None:
+        return None
+    dates, ratings = entry
+    i = int(np.searchsorted(dates, pd.Timestamp(date).to_datetime64(), side="right")) - 1
+    if i < 0:
+        return None
+    return float(ratings[i])
+
+
+def replay_games(engines: dict[str, RatingEngine]) -> dict[str, np.ndarray]:
+    """Feed every game to all engines in a single chronological pass over results_df.
+    Returns the pre-game prediction correctness flags (int8 1/0 per game) for each engine."""
+    flags: dict[str, np.ndarray] = {}
+
+    # Array-backed engines replay the whole season by integer team code in one call,
+    # with the per-game context signals passed as aligned arrays
+    looped = {}
+    home = results_df["HOME_TEAM"].to_numpy()
+    vec_ctx = {
+        "home_sign": np.where(home == results_df["WIN_TEAM"].to_numpy(), 1,
+                              np.where(home == results_df["LOSE_TEAM"].to_numpy(), -1, 0)).astype(np.int8),
+        "margin": results_df["MARGIN"].to_numpy(),
+        "is_playoff": results_df["IS_PLAYOFF"].to_numpy(),
+    }
+    for name, engine in engines.items():
+        if hasattr(engine, "record_games_vec"):
+            p_win = engine.record_games_vec(win_codes, lose_codes, results_df["GAME_DATE"].to_numpy(),
+                                            team_names, vec_ctx)
+            flags[name] = (p_win >= 0.5).astype(np.int8)
+        else:
+            looped[name] = engine
+    if not looped:
+        return flags
+
+    # Extract the columns once and share each row across the remaining engines
+    columns = zip(
+        results_df["WIN_TEAM"].to_numpy(),
+        results_df["LOSE_TEAM"].to_numpy(),
+        results_df["GAME_DATE"].to_numpy(),
+        results_df["HOME_TEAM"].to_numpy(),
+        results_df["MARGIN"].to_numpy(),
+        results_df["IS_PLAYOFF"].to_numpy(),
+    )
+    # Pre-game ratings/uncertainties per engine; predictions are computed in one batch afterwards.
+    # Unknown uncertainties stay NaN.
+    n = len(results_df)
+    pregame = {name: [[math.nan] * n for _ in range(4)] for name in looped}
+
+    # Resolve every engine's bound methods once instead of looking them up for every game
+    def _uncertainty_getter(engine: RatingEngine):
+        def get_u(team):
+            try:
+                return engine.get_uncertainty(team)
+            except Exception:
+                return None
+        return get_u
+
+    # Engines that do not override record_game_ctx get record_game itself, so the context
+    # keyword arguments are only built for engines that read them
+    def _updater(engine: RatingEngine):
+        if type(engine).record_game_ctx is RatingEngine.record_game_ctx:
+            return engine.record_game, False
+        return engine.record_game_ctx, True
+
+    bound = [
+        (engine.get_rating, _uncertainty_getter(engine), *_updater(engine), *pregame[name])
+        for name, engine in looped.items()
+    ]
+    for i, (win, lose, gdate, home, margin, is_playoff) in enumerate(columns):
+        for get_r, get_u, update, uses_ctx, r_win, r_lose, rd_win, rd_lose in bound:
+            # Get current ratings (before updating) and uncertainties (if available)
+            r_win[i] = float(get_r(win))
+            r_lose[i] = float(get_r(lose))
+            u = get_u(win)
+            if u is not None:
+                rd_win[i] = u
+            u = get_u(lose)
+            if u is not None:
+                rd_lose[i] = u
+
+            # Now update the engine with the actual result
+            if uses_ctx:
+                update(win, lose, gdate, home_team=home, margin=margin, is_playoff=is_playoff)
+            else:
+                update(win, lose, gdate)
+
+    # Probability that the actual winner beats the loser BEFORE each update, for all games at once
+    for name, engine in looped.items():
+        r_win, r_lose, rd_win, rd_lose = (np.asarray(col, dtype=np.float64) for col in pregame[name])
+        p_win = engine.win_prob_batch(r_win, r_lose, rd_win, rd_lose)
+        flags[name] = (p_win >= 0.5).astype(np.int8)
+    # Report in the caller's engine order regardless of which path replayed each engine
+    return {name: flags[name] for name in engines}
+
+
+# Engines are independent, so where processes can be forked the engines replay in parallel
+# worker processes. Forked workers inherit results_df and the team coding, so only the engine
+# name goes in and only its flags and snapshot frame come back (not the engine and its state).
+# Falls back to one shared pass when a pool cannot be started or its results cannot be sent back.
+PARALLEL_ENGINES = True
+
+
+def _replay_one(engine_name: str) -> tuple[np.ndarray, pd.DataFrame]:
+    """Pool worker: build one engine from ENGINES_TO_RUN, replay every game and return its
+    correctness flags and post-game snapshots (history_df), which is all export_engine needs."""
+    engine = dict(ENGINES_TO_RUN)[engine_name]()
+    flags = replay_games({engine_name: engine})[engine_name]
+    return flags, engine.history_df()
+
+
+def replay_engines(engine_names: list[str]) -> tuple[dict[str, pd.DataFrame], dict[str, np.ndarray]]:
+    """Replay the named engines, in parallel processes when possible.
+    Returns each engine's snapshot frame and pre-game correctness flags, both in name order."""
+    workers = min(len(engine_names), os.cpu_count() or 1)
+    if PARALLEL_ENGINES and workers > 1 and "fork" in mp.get_all_start_methods():
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("fork")) as pool:
+                replayed = list(pool.map(_replay_one, engine_names))
+            flags = {name: fl for name, (fl, _) in zip(engine_names, replayed)}
+            histories = {name: hist for name, (_, hist) in zip(engine_names, replayed)}
+            return histories, flags
+        # Only pool start-up and transport failures fall back; errors raised inside an engine propagate
+        except (OSError, BrokenProcessPool, pickle.PicklingError) as e:
+            print(f"Parallel replay unavailable ({e}); replaying engines in one pass")
+    factories = dict(ENGINES_TO_RUN)
+    engines = {name: factories[name]() for name in engine_names}
+    flags = replay_games(engines)
+    return {name: engine.history_df() for name, engine in engines.items()}, flags
+
+
+def run_engine(engine_name: str, factory, dense: bool = EXPORT_DENSE_PANEL) -> pd.DataFrame:
+    """Run a single engine through all matches, save CSV and plot, and return the exported DataFrame."""
+    engine: RatingEngine = factory()
     # Attach a correctness column to results_df for this engine
-    results_df[f"PRED_CORRECT_{engine_name}"] = pred_correct_flags
+    results_df[f"PRED_CORRECT_{engine_name}"] = replay_games({engine_name: engine})[engine_name]
+    full = export_engine(engine_name, engine.history_df(), dense=dense)
+    if SAVE_PLOTS:
+        plot_engine(engine_name, engine_panels[engine_name])
+    return full
+
+
+def export_engine(engine_name: str, ratings_df: pd.DataFrame, dense: bool = EXPORT_DENSE_PANEL) -> pd.DataFrame:
+    """Save a replayed engine's ratings (its history_df() snapshots) to CSV and return the exported frame.
+    dense=True writes the forward-filled daily date x team panel; dense=False writes only the
+    post-game snapshot rows, which is all that rating lookups (build_team_ratings) need."""
+    engine_snapshots[engine_name] = ratings_df
+    all_teams = ratings_df["TEAM"].unique()
 
-    # Create DataFrame of recorded ratings from the engine
-    ratings_df = pd.DataFrame(engine.history)
+    # Game-day x team rectangle; ratings only change on game days
+    wide = ratings_df.pivot_table(index="GAME_DATE", columns="TEAM", values="RATING", aggfunc="last")
+    if not dense:
+        engine_panels[engine_name] = wide.reindex(columns=all_teams).ffill()
+        csv_path = _out_data_dir / f"ratings_{engine_name}_snapshots.csv"
+        ratings_df.to_csv(str(csv_path), index=False, date_format="%Y-%m-%d")
+        print(f"✅ {engine_name} rating snapshots exported to {csv_path}")
+        return ratings_df
 
-    # Get full date range and teams
+    # Build full ratings panel: reindex to every calendar day and forward fill columns in one pass
     all_dates = pd.date_range(start=ratings_df["GAME_DATE"].min(),
                               end=ratings_df["GAME_DATE"].max(),
                               freq="D")
-    all_teams = ratings_df["TEAM"].unique()
-
-    # Build full ratings panel and forward fill
-    full_index = pd.MultiIndex.from_product([all_dates, all_teams], names=["GAME_DATE", "TEAM"])
-    full_ratings = ratings_df.set_index(["GAME_DATE", "TEAM"]).reindex(full_index)
-    full_ratings = full_ratings.groupby("TEAM").ffill().reset_index()
+    wide = wide.reindex(index=all_dates, columns=all_teams).ffill()
+    full_ratings = pd.DataFrame({
+        "GAME_DATE": np.repeat(wide.index.to_numpy(), len(all_teams)),
+        "TEAM": np.tile(np.asarray(all_teams, dtype=object), len(wide)),
+        "RATING": wide.to_numpy().ravel(),
+    })
 
     # Save CSV per engine
     csv_path = _out_data_dir / f"ratings_{engine_name}.csv"
-    full_ratings.to_csv(str(csv_path), index=False)
+    full_ratings.to_csv(str(csv_path), index=False, date_format="%Y-%m-%d")
     print(f"✅ {engine_name} full_ratings exported to {csv_path}")
 
-    # Plot and save per engine
-    plt.figure(figsize=(14, 8))
-    for team in all_teams:
-        team_data = full_ratings[full_ratings["TEAM"] == team]
-        plt.plot(team_data["GAME_DATE"], team_data["RATING"], label=team)
-    plt.title(f"{engine_name.capitalize()} Ratings Over Time for All Teams")
-    plt.xlabel("Date")
-    plt.ylabel("Rating")
-    plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left', fontsize='small')
-    plt.tight_layout()
+    # Keep the wide panel so plotting does not need to re-slice the long frame per team
+    engine_panels[engine_name] = wide
+    return full_ratings
+
+
+def plot_engine(engine_name: str, wide: pd.DataFrame, ax=None) -> None:
+    """Plot every team's rating over time from the wide date x team panel and save the PNG.
+    Pass an existing `ax` to redraw into a reused figure instead of creating (and closing) one."""
+    owns_fig = ax is None
+    if owns_fig:
+        _, ax = plt.subplots(figsize=(14, 8))
+    else:
+        ax.clear()
+    fig = ax.figure
+    # One call draws all team columns; labels come from the panel columns
+    ax.plot(wide.index, wide.to_numpy())
+    ax.set_title(f"{engine_name.capitalize()} Ratings Over Time for All Teams")
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Rating")
+    ax.legend(wide.columns, bbox_to_anchor=(1.05, 1), loc='upper left', fontsize='small')
+    fig.tight_layout()
     img_path = _out_visuals_dir / f"{engine_name}_ratings_over_time.png"
-    plt.savefig(str(img_path), dpi=300)
-    plt.close()
+    fig.savefig(str(img_path), dpi=PLOT_DPI)
+    if owns_fig:
+        plt.close(fig)
     print(f"✅ {engine_name} plot saved as {img_path}")
 
-    return full_ratings
-
 # Run all engines and keep the last full_ratings in memory for downstream helpers
-for _name, _factory in ENGINES_TO_RUN:
-    full_ratings = run_engine(_name, _factory)
+# Engines replay in parallel (or in one shared chronological pass), then export one by one
+_histories, _all_flags = replay_engines([_name for _name, _ in ENGINES_TO_RUN])
+for _name, _flags in _all_flags.items():
+    results_df[f"PRED_CORRECT_{_name}"] = _flags
+for _name, _history in _histories.items():
+    full_ratings = export_engine(_name, _history)
+team_ratings = build_team_ratings(engine_snapshots[_name])
+# Plotting runs after every CSV is on disk so a rendering failure cannot block the exports.
+# One figure is created and redrawn for each engine rather than rebuilt from scratch.
+if SAVE_PLOTS:
+    _fig, _ax = plt.subplots(figsize=(14, 8))
+    for _plot_name, _wide in engine_panels.items():
+        plot_engine(_plot_name, _wide, ax=_ax)
+    plt.close(_fig)
 
 _results_path = _out_data_dir / "results_with_predictions.csv"
-results_df.to_csv(str(_results_path), index=False)
+results_df.to_csv(str(_results_path), index=False, date_format="%Y-%m-%d")
 print("✅ results_with_predictions.csv saved with per-engine correctness columns")
 
-# Quick accuracy summary
-try:
-    _df_acc = pd.read_csv(str(_results_path))
-    _acc_cols = [c for c in _df_acc.columns if c.startswith("PRED_CORRECT_")]
-    if _acc_cols:
-        _means = _df_acc[_acc_cols].mean().sort_values(ascending=False)
-        print("Mean correctness by engine:")
-        for k, v in _means.items():
-            print(f"  {k}: {v:.3f}")
-except Exception as e:
-    print(f"Could not compute mean correctness summary: {e}")
+# Quick accuracy summary straight from the in-memory frame (no need to re-parse the CSV)
+_acc_cols = [c for c in results_df.columns if c.startswith("PRED_CORRECT_")]
+if _acc_cols:
+    _means = results_df[_acc_cols].mean().sort_values(ascending=False)
+    print("Mean correctness by engine:")
+    for k, v in _means.items():
+        print(f"  {k}: {v:.3f}")
 
-# %% (Removed old export and plot block; handled per engine in run_engine above)
+# %% (Removed old export and plot block; handled per engine by plot_engine above)
 
 # %%
 
-# Note: full_ratings here refers to the ratings from the last engine executed in the loop above.
+# Note: team_ratings here holds the snapshots of the last engine executed in the loop above.
 # Function to compute win probability between two teams at specified dates using the active engine
 
 def compute_win_probability(team_A_name, date_A, team_B_name, date_B, engine: RatingEngine):
     """
-    Compute win probability of team_A (at date_A) vs team_B (at date_B) using ratings from `full_ratings`
-    and uncertainty (if available) from the provided `engine`.
+    Compute win probability of team_A (at date_A) vs team_B (at date_B) using the latest rating
+    on or before each date from `team_ratings` and uncertainty (if available) from the provided `engine`.
     """
     date_A = pd.to_datetime(date_A)
     date_B = pd.to_datetime(date_B)
 
-    rating_row_A = full_ratings[(full_ratings["TEAM"] == team_A_name) & (full_ratings["GAME_DATE"] == date_A)]
-    rating_row_B = full_ratings[(full_ratings["TEAM"] == team_B_name) & (full_ratings["GAME_DATE"] == date_B)]
+    rating_A = rating_on_or_before(team_ratings, team_A_name, date_A)
+    rating_B = rating_on_or_before(team_ratings, team_B_name, date_B)
 
-    if rating_row_A.empty or rating_row_B.empty:
+    if rating_A is None or rating_B is None:
         print("Rating not found for one or both teams on the specified dates.")
         return None
 
-    rating_A = float(rating_row_A["RATING"].values[0])
-    rating_B = float(rating_row_B["RATING"].values[0])
-
     # Try to fetch per-team uncertainties from the engine, if defined
     rd_A = None
     rd_B = None
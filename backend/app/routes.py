@@ -6,7 +6,8 @@ to Python functions that return JSON responses. Each route corresponds to a spec
 handling data retrieval, validation, and prediction logic as needed.
 """
 import os
-from flask import Blueprint, jsonify, request
+from functools import lru_cache
+from flask import Blueprint, current_app, jsonify, request
 from services.ratings import teams, seasons_for_team, predict_prob, load_full, resolved_csv_path
 from services import ratings
 
@@ -37,12 +38,25 @@ def health():
         payload["csv_error"] = csv_error
     return jsonify(payload)
 
+# /teams and /seasons only change when the ratings CSV does, so their encoded bodies are
+# cached per data version and served without re-serialising on every request
+@lru_cache(maxsize=1)
+def _teams_body(version) -> bytes:
+    return current_app.json.response(teams=teams()).get_data()
+
+@lru_cache(maxsize=256)
+def _seasons_body(version, team: str) -> bytes:
+    return current_app.json.response(team=team, seasons=seasons_for_team(team)).get_data()
+
+def _json_bytes(body: bytes):
+    return current_app.response_class(body, mimetype="application/json")
+
 @api_bp.get("/teams")
 def get_teams():
     # Get all available NBA teams
     # URL: GET /teams
     # Returns: JSON list of team names
-    return jsonify(teams=teams())
+    return _json_bytes(_teams_body(ratings.data_version()))
 
 @api_bp.get("/seasons")
 def get_seasons():
@@ -53,15 +67,13 @@ def get_seasons():
     if not team:
         # Validate that the team query parameter is provided
         return jsonify(error="team query param required"), 400
-    return jsonify(team=team, seasons=seasons_for_team(team))
+    return _json_bytes(_seasons_body(ratings.data_version(), team))
 
-@api_bp.post("/predict")
-def predict():
-    # Predict the outcome probability between two teams in given seasons
-    # URL: POST /predict
-    # Accepts: JSON with home_team, away_team, home_season, away_season
-    # Returns: JSON with prediction result and model version
-    data = request.get_json(force=True) or {}
+def _predict_one(data):
+    """
+    Validate one prediction request body and run it.
+    Returns (payload, status) so the single and batch routes share the same rules.
+    """
     home_team = data.get("home_team")
     away_team = data.get("away_team")
     home_season = data.get("home_season")
@@ -69,26 +81,26 @@ def predict():
 
     # Validate that all required fields are present
     if not all([home_team, away_team, home_season, away_season]):
-        return jsonify(error="home_team, away_team, home_season, away_season are required"), 400
+        return {"error": "home_team, away_team, home_season, away_season are required"}, 400
 
     # Prevent comparing the same team in the same season
     if home_team == away_team and home_season == away_season:
-        return jsonify(error="If the same team is chosen the seasons must differ"), 400
+        return {"error": "If the same team is chosen the seasons must differ"}, 400
 
     try:
         hs = int(home_season)
         as_ = int(away_season)
     except (TypeError, ValueError):
-        return jsonify(error="home_season and away_season must be integers"), 400
+        return {"error": "home_season and away_season must be integers"}, 400
 
     # Call the prediction logic from the services layer
     result = predict_prob(home_team, hs, away_team, as_)
     if "error" in result:
         # If prediction returns an error, return 404
-        return jsonify(error=result["error"]), 404
+        return {"error": result["error"]}, 404
 
     # Return the prediction results along with the input parameters and model version
-    return jsonify({
+    return {
         "inputs": {
             "home_team": home_team,
             "home_season": hs,
@@ -97,7 +109,74 @@ def predict():
         },
         **result,
         "model_version": "glicko_csv_v1",
-    })
+    }, 200
+
+@api_bp.post("/predict")
+def predict():
+    # Predict the outcome probability between two teams in given seasons
+    # URL: POST /predict
+    # Accepts: JSON with home_team, away_team, home_season, away_season
+    # Returns: JSON with prediction result and model version
+    data = request.get_json(force=True) or {}
+    payload, status = _predict_one(data)
+    return jsonify(payload), status
+
+@api_bp.post("/predict/batch")
+def predict_batch():
+    # Predict several matchups in one round trip
+    # URL: POST /predict/batch
+    # Accepts: JSON list of /predict bodies, or {"items": [...]}
+    # Returns: JSON with one result per item, in order; failed items carry error and status
+    data = request.get_json(force=True)
+    items = data.get("items") if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        return jsonify(error="body must be a list of predictions or {\"items\": [...]}"), 400
+
+    results = []
+    for item in items:
+        if not isinstance(item, dict):
+            results.append({"error": "each item must be an object", "status": 400})
+            continue
+        payload, status = _predict_one(item)
+        if status != 200:
+            payload["status"] = status
+        results.append(payload)
+    return jsonify(results=results)
+
+# The matrix grows with the square of the entries, so cap how many one request may ask for
+PREDICT_MATRIX_MAX_ENTRIES = 64
+
+@api_bp.post("/predict/matrix")
+def predict_matrix():
+    # Home win probabilities for every pairing of several team seasons
+    # URL: POST /predict/matrix
+    # Accepts: JSON {"entries": [{"team": TEAM_NAME, "season": YEAR}, ...]}
+    # Returns: JSON with the entries, their ratings, and home_win_prob[i][j] for entry i hosting entry j
+    data = request.get_json(force=True) or {}
+    entries = data.get("entries") if isinstance(data, dict) else None
+    if not isinstance(entries, list) or not entries:
+        return jsonify(error="entries must be a non empty list of {team, season}"), 400
+    if len(entries) > PREDICT_MATRIX_MAX_ENTRIES:
+        return jsonify(error=f"at most {PREDICT_MATRIX_MAX_ENTRIES} entries are allowed"), 400
+
+    pairs = []
+    for entry in entries:
+        if not isinstance(entry, dict) or not entry.get("team") or entry.get("season") is None:
+            return jsonify(error="each entry needs team and season"), 400
+        try:
+            pairs.append((entry["team"], int(entry["season"])))
+        except (TypeError, ValueError):
+            return jsonify(error="season must be an integer"), 400
+
+    result = ratings.predict_matrix(pairs)
+    if "error" in result:
+        return jsonify(error=result["error"]), 404
+
+    return jsonify(
+        entries=[{"team": team, "season": season} for team, season in pairs],
+        **result,
+        model_version="glicko_csv_v1",
+    )
 
 @api_bp.get("/ratings/series")
 def ratings_series():
@@ -132,14 +211,19 @@ def ratings_series():
     except ValueError:
         return jsonify(error="offset and limit must be integers"), 400
 
-    records = df.to_dict(orient="records")
-    total = len(records)
+    total = len(df)
     if offset < 0:
         offset = 0
+    # Paginate before conversion so only the requested rows become Python objects
     if limit is not None and limit >= 0:
-        sliced = records[offset: offset + limit]
+        page = df.iloc[offset: offset + limit]
     else:
-        sliced = records[offset:]
+        page = df.iloc[offset:]
+
+    # Build records from native column lists rather than DataFrame.to_dict
+    cols = list(page.columns)
+    values = [page[c].tolist() for c in cols]
+    sliced = [dict(zip(cols, row)) for row in zip(*values)]
 
     return jsonify(data=sliced, total=total, offset=offset, limit=limit)
 
@@ -2,7 +2,19 @@
 import os
 
 bind = f"0.0.0.0:{os.getenv('PORT', '5055')}"  # default to 5055 locally
-workers = 2
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
 worker_class = "gthread"
-threads = 8
-timeout = 120
\ No newline at end of file
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+keepalive = 5  # reuse client connections between frontend polls
+timeout = 120
+preload_app = True  # import main once in the master so workers inherit the loaded ratings
+
+def when_ready(server):
+    """Parse the ratings CSV in the preloaded master so forked workers share the
+    cached DataFrame instead of each loading it on first hit."""
+    from services.ratings import load_full
+
+    try:
+        load_full()
+    except Exception as exc:  # still surfaced per request by /api and /api/selftest
+        server.log.warning("Ratings warm-up skipped: %s", exc)
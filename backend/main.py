@@ -1,13 +1,40 @@
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
 from flask_cors import CORS
+import gzip
 import os
 from app.routes import api_bp
 
+# JSON bodies smaller than this are sent as is; gzip framing would outweigh the saving
+GZIP_MIN_BYTES = 1024
+GZIP_LEVEL = 4
+
+def _gzip_json(response):
+    """Gzip JSON responses for clients that accept it (large /ratings/series pages mostly)."""
+    if (
+        response.status_code != 200
+        or response.mimetype != "application/json"
+        or response.direct_passthrough
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+    response.vary.add("Accept-Encoding")
+    if "gzip" not in request.accept_encodings:
+        return response
+    body = response.get_data()
+    if len(body) < GZIP_MIN_BYTES:
+        return response
+    response.set_data(gzip.compress(body, compresslevel=GZIP_LEVEL))
+    response.headers["Content-Encoding"] = "gzip"
+    return response
+
 def create_app():
     app = Flask(__name__)
+    # Skip per-response key sorting; clients read fields by name
+    app.json.sort_keys = False
     allowed = os.getenv("ALLOWED_ORIGINS", "").split(",") if os.getenv("ALLOWED_ORIGINS") else "*"
     CORS(app, resources={r"/*": {"origins": allowed}}, supports_credentials=True)
     app.register_blueprint(api_bp, url_prefix="/api")
+    app.after_request(_gzip_json)
 
     @app.get("/health")
     def health():
@@ -18,4 +45,5 @@ def create_app():
 app = create_app()
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=int(os.getenv("PORT", 5055)), debug=True)
\ No newline at end of file
+    # Debug mode (reloader, interactive debugger) is opt in via DEBUG=1
+    app.run(host="0.0.0.0", port=int(os.getenv("PORT", 5055)), debug=os.getenv("DEBUG", "0") == "1")
\ No newline at end of file
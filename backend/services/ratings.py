@@ -9,10 +9,14 @@ import os
 import math
 from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+# 10 ** (x / 400) == exp(x * ln(10) / 400), used by the Elo style probability
+_LN10_OVER_400 = math.log(10.0) / 400.0
+
 # Build a robust path to the ratings CSV
 def _default_ratings_path() -> Path:
     # services/ -> app/ -> project root (/app in Docker)
@@ -25,24 +29,100 @@ def get_ratings_csv_path() -> Path:
         return Path(env).expanduser().resolve()
     return _default_ratings_path()
 
+def _parse_ratings_csv(csv_path: str) -> pd.DataFrame:
+    # The pipeline writes ISO dates, so give the parser the format and column types
+    # up front rather than letting it infer them
+    df = pd.read_csv(
+        csv_path,
+        # ~30 team names repeat over every row, so store them as categorical codes.
+        # RATING stays float64: float32 would round the ratings the API returns.
+        dtype={"TEAM": "category", "RATING": "float64"},
+    )
+    if "GAME_DATE" in df.columns:
+        # A date that does not parse becomes NaT; the row itself is kept
+        df["GAME_DATE"] = pd.to_datetime(df["GAME_DATE"], format="%Y-%m-%d", errors="coerce")
+    if "YEAR" not in df.columns and "GAME_DATE" in df.columns:
+        # Nullable, so an undated row simply has no season
+        df["YEAR"] = df["GAME_DATE"].dt.year.astype("Int16")
+    return df
+
 @lru_cache(maxsize=1)
-def load_full() -> pd.DataFrame:
+def _read_ratings(csv_path: str, mtime_ns: int) -> pd.DataFrame:
     """
-    Read the ratings CSV once and cache the DataFrame.
-    Ensures a YEAR column exists derived from GAME_DATE.
+    Parse the ratings CSV. Cached on (path, mtime) so an unchanged file is parsed once
+    and a replaced or regenerated file is picked up on the next call.
     """
+    return _parse_ratings_csv(csv_path)
+
+def _ratings_key() -> Tuple[str, int]:
+    """Return the (path, mtime) pair the ratings caches are keyed on."""
     csv_path = get_ratings_csv_path()
-    if not csv_path.exists():
+    try:
+        mtime_ns = csv_path.stat().st_mtime_ns
+    except FileNotFoundError:
         raise FileNotFoundError(
             f"Ratings CSV not found at {csv_path}. "
             "Place the file at backend/data/full_ratings.csv (note case sensitive 'data'), "
             "or set RATINGS_CSV to an absolute path."
-        )
+        ) from None
+    return str(csv_path), mtime_ns
 
-    df = pd.read_csv(csv_path, parse_dates=["GAME_DATE"])
-    if "YEAR" not in df.columns and "GAME_DATE" in df.columns:
-        df["YEAR"] = df["GAME_DATE"].dt.year
-    return df
+def data_version() -> Tuple[str, int]:
+    """
+    Return a hashable token that changes whenever the ratings CSV is replaced,
+    for callers that cache values derived from load_full().
+    """
+    return _ratings_key()
+
+def load_full() -> pd.DataFrame:
+    """
+    Return the cached ratings DataFrame, re-reading the CSV only when its
+    path or modification time changes. Each call costs a single stat().
+    Ensures a YEAR column exists derived from GAME_DATE.
+    """
+    return _read_ratings(*_ratings_key())
+
+@lru_cache(maxsize=1)
+def _team_index(csv_path: str, mtime_ns: int) -> Tuple[List[str], Dict[str, List[int]]]:
+    """
+    Sorted team names and each team's seasons (newest first), built once per
+    loaded CSV so /teams and /seasons are lookups rather than DataFrame scans.
+    """
+    df = _read_ratings(csv_path, mtime_ns)
+    team_names = sorted(df["TEAM"].dropna().unique().tolist())
+    years = df.dropna(subset=["TEAM", "YEAR"]).groupby("TEAM", observed=True)["YEAR"].unique()
+    seasons = {
+        team: sorted({int(y) for y in vals}, reverse=True)
+        for team, vals in years.items()
+    }
+    return team_names, seasons
+
+@lru_cache(maxsize=1)
+def _latest_index(csv_path: str, mtime_ns: int) -> Dict[Tuple[str, int], float]:
+    """
+    Map (team, year) to the team's most recent rating in that season, built once
+    per loaded CSV so predictions are two dict lookups instead of two frame filters.
+    """
+    df = _read_ratings(csv_path, mtime_ns)
+    # If your CSV has a column named RATING use that. Adjust here if the name differs.
+    col = "RATING"
+    if col not in df.columns:
+        raise KeyError(f"Column '{col}' not found in ratings CSV")
+    sub = df.dropna(subset=["TEAM", "YEAR"]).sort_values("GAME_DATE", kind="stable")
+    last = sub.drop_duplicates(subset=["TEAM", "YEAR"], keep="last")
+    return {
+        (team, int(year)): float(rating)
+        for team, year, rating in zip(last["TEAM"].tolist(), last["YEAR"].tolist(), last[col].tolist())
+    }
+
+def _clear_caches():
+    _read_ratings.cache_clear()
+    _team_index.cache_clear()
+    _latest_index.cache_clear()
+    _series_frame.cache_clear()
+
+# Keep the lru_cache style API callers and tests already use
+load_full.cache_clear = _clear_caches
 
 def resolved_csv_path() -> str:
     """Return the absolute CSV path the service will use for diagnostics."""
@@ -52,58 +132,55 @@ def clear_cache():
     """Clear the cached ratings DataFrame."""
     load_full.cache_clear()
 
+@lru_cache(maxsize=1)
+def _series_frame(csv_path: str, mtime_ns: int) -> pd.DataFrame:
+    """
+    The full series in API shape (date, team, rating), sorted by date and with
+    ISO date strings formatted once per loaded CSV rather than on every request.
+    """
+    df = _read_ratings(csv_path, mtime_ns)
+    # get_series binary searches this frame's dates, which needs every row to have one;
+    # undated rows cannot fall inside any date range anyway
+    df = df[df["GAME_DATE"].notna()].sort_values("GAME_DATE", kind="stable")
+    return pd.DataFrame({
+        "date": df["GAME_DATE"].dt.strftime("%Y-%m-%d").to_numpy(),
+        "team": df["TEAM"].to_numpy(),
+        "rating": df["RATING"].to_numpy(),
+    })
+
 def get_series(teams: Optional[List[str]] = None, start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
     """
     Return a DataFrame with rating time series filtered by teams and date range.
+    The result is a read-only slice of a cached frame; copy it before modifying.
     """
-    df = load_full().copy()
-    df = df.sort_values("GAME_DATE")
-    df["date"] = df["GAME_DATE"].dt.strftime("%Y-%m-%d")
+    out = _series_frame(*_ratings_key())
+    # Rows are date sorted, so the start/end bounds are a binary search on the ISO
+    # strings (same comparison as before) instead of a mask over every row
+    dates = out["date"].to_numpy()
+    lo = int(np.searchsorted(dates, start, side="left")) if start else 0
+    hi = int(np.searchsorted(dates, end, side="right")) if end else len(dates)
+    out = out.iloc[lo:hi]
 
     if teams:
-        df = df[df["TEAM"].isin(teams)]
-
-    if start:
-        df = df[df["date"] >= start]
-
-    if end:
-        df = df[df["date"] <= end]
-
-    out = df.loc[:, ["date", "TEAM", "RATING"]].rename(columns={"TEAM": "team", "RATING": "rating"})
+        out = out[out["team"].isin(teams)]
     return out
 
 def teams() -> List[str]:
     """Return all unique team names sorted alphabetically."""
-    df = load_full()
-    vals = df["TEAM"].dropna().unique().tolist()
-    return sorted(vals)
+    team_names, _ = _team_index(*_ratings_key())
+    return list(team_names)
 
 def seasons_for_team(team: str) -> List[int]:
     """Return all seasons available for a team sorted from newest to oldest."""
-    df = load_full()
-    vals = (
-        df.loc[df["TEAM"] == team, "YEAR"]
-        .dropna()
-        .astype(int)
-        .unique()
-        .tolist()
-    )
-    return sorted(vals, reverse=True)
+    _, seasons = _team_index(*_ratings_key())
+    return list(seasons.get(team, []))
 
 def latest_rating_in_season(team: str, year: int) -> Optional[float]:
     """
     Return the team's most recent rating within that season.
     If no rows match, return None.
     """
-    df = load_full()
-    sub = df[(df["TEAM"] == team) & (df["YEAR"] == int(year))].sort_values("GAME_DATE")
-    if sub.empty:
-        return None
-    # If your CSV has a column named RATING use that. Adjust here if the name differs.
-    col = "RATING"
-    if col not in sub.columns:
-        raise KeyError(f"Column '{col}' not found in ratings CSV")
-    return float(sub.iloc[-1][col])
+    return _latest_index(*_ratings_key()).get((team, int(year)))
 
 def predict_prob(home_team: str, home_year: int, away_team: str, away_year: int) -> dict:
     """
@@ -120,7 +197,7 @@ def predict_prob(home_team: str, home_year: int, away_team: str, away_year: int)
 
     diff = hr - ar
     # Elo style probability for home
-    p_home = 1.0 / (1.0 + math.pow(10.0, -diff / 400.0))
+    p_home = 1.0 / (1.0 + math.exp(-diff * _LN10_OVER_400))
     # Simple linear margin proxy
     margin = diff / 25.0
 
@@ -130,4 +207,32 @@ def predict_prob(home_team: str, home_year: int, away_team: str, away_year: int)
         "rating_diff": diff,
         "home_win_prob": p_home,
         "predicted_margin": margin,
-    }
\ No newline at end of file
+    }
+
+def ratings_matrix_probs(ratings: np.ndarray) -> np.ndarray:
+    """
+    All-pairs version of predict_prob's home win probability: entry [i, j] is the
+    probability that the team rated ratings[i] beats the team rated ratings[j].
+    Computed as one broadcast NumPy expression rather than N * N scalar calls.
+    """
+    r = np.asarray(ratings, dtype=np.float64)
+    return 1.0 / (1.0 + np.exp((r[None, :] - r[:, None]) * _LN10_OVER_400))
+
+def predict_matrix(entries: List[Tuple[str, int]]) -> dict:
+    """
+    predict_prob for every pairing of the given (team, season) entries at once.
+    Uses each entry's latest rating in that season; home_win_prob[i][j] is the
+    probability entry i beats entry j when i is at home.
+    """
+    index = _latest_index(*_ratings_key())
+    found = []
+    for team, year in entries:
+        rating = index.get((team, int(year)))
+        if rating is None:
+            return {"error": f"No rating found for {team} in {year}"}
+        found.append(rating)
+
+    return {
+        "ratings": found,
+        "home_win_prob": ratings_matrix_probs(found).tolist(),
+    }
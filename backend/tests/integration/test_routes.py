@@ -10,6 +10,9 @@ but now through the HTTP interface rather than calling helpers directly.
 
 from pathlib import Path
 import pandas as pd
+import gzip
+import json
+import main
 from main import app
 import pytest
 from services import ratings as ratings_mod
@@ -114,4 +117,94 @@ def test_predict_validates_same_team_same_season(tmp_path, monkeypatch):
     }
     res = client.post("/api/predict", json=body)
     assert res.status_code == 400
-    assert "If the same team is chosen the seasons must differ" in res.get_json()["error"]
\ No newline at end of file
+    assert "If the same team is chosen the seasons must differ" in res.get_json()["error"]
+
+def test_ratings_series_paginates(tmp_path, monkeypatch):
+    path = make_sample_csv(tmp_path)
+    monkeypatch.setenv("RATINGS_CSV", str(path))
+    importlib.reload(ratings_mod)
+    ratings_mod.load_full.cache_clear()
+
+    client = app.test_client()
+    res = client.get("/api/ratings/series?teams=Boston Celtics&offset=1&limit=5")
+    assert res.status_code == 200
+    payload = res.get_json()
+    assert payload["total"] == 2
+    assert payload["offset"] == 1
+    assert payload["data"] == [{"date": "2022-12-01", "team": "Boston Celtics", "rating": 1530.0}]
+
+
+def test_predict_batch_returns_results_in_order(tmp_path, monkeypatch):
+    path = make_sample_csv(tmp_path)
+    monkeypatch.setenv("RATINGS_CSV", str(path))
+    importlib.reload(ratings_mod)
+    ratings_mod.load_full.cache_clear()
+
+    client = app.test_client()
+    body = {
+        "items": [
+            {
+                "home_team": "Los Angeles Lakers",
+                "home_season": 2021,
+                "away_team": "Boston Celtics",
+                "away_season": 2022,
+            },
+            {
+                "home_team": "Boston Celtics",
+                "home_season": 2021,
+                "away_team": "Boston Celtics",
+                "away_season": 2021,
+            },
+        ]
+    }
+    res = client.post("/api/predict/batch", json=body)
+    assert res.status_code == 200
+    results = res.get_json()["results"]
+    assert len(results) == 2
+    assert 0.0 <= results[0]["home_win_prob"] <= 1.0
+    assert results[0]["inputs"]["away_season"] == 2022
+    assert results[1]["status"] == 400
+    assert "error" in results[1]
+
+
+def test_ratings_series_gzipped_when_accepted(tmp_path, monkeypatch):
+    path = make_sample_csv(tmp_path)
+    monkeypatch.setenv("RATINGS_CSV", str(path))
+    importlib.reload(ratings_mod)
+    ratings_mod.load_full.cache_clear()
+    monkeypatch.setattr(main, "GZIP_MIN_BYTES", 0)
+
+    client = app.test_client()
+    plain = client.get("/api/ratings/series")
+    assert "Content-Encoding" not in plain.headers
+
+    res = client.get("/api/ratings/series", headers={"Accept-Encoding": "gzip"})
+    assert res.status_code == 200
+    assert res.headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(res.data)) == plain.get_json()
+
+
+def test_predict_matrix_matches_single_predictions(tmp_path, monkeypatch):
+    path = make_sample_csv(tmp_path)
+    monkeypatch.setenv("RATINGS_CSV", str(path))
+    importlib.reload(ratings_mod)
+    ratings_mod.load_full.cache_clear()
+
+    client = app.test_client()
+    body = {"entries": [
+        {"team": "Boston Celtics", "season": 2022},
+        {"team": "Los Angeles Lakers", "season": "2021"},
+    ]}
+    res = client.post("/api/predict/matrix", json=body)
+    assert res.status_code == 200
+    data = res.get_json()
+    assert data["entries"][1] == {"team": "Los Angeles Lakers", "season": 2021}
+    single = client.post("/api/predict", json={
+        "home_team": "Boston Celtics", "home_season": 2022,
+        "away_team": "Los Angeles Lakers", "away_season": 2021,
+    }).get_json()
+    assert data["home_win_prob"][0][1] == pytest.approx(single["home_win_prob"])
+
+    missing = client.post("/api/predict/matrix", json={"entries": [{"team": "Chicago Bulls", "season": 2022}]})
+    assert missing.status_code == 404
+    assert client.post("/api/predict/matrix", json={"entries": []}).status_code == 400
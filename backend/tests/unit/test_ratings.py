@@ -8,6 +8,7 @@ These tests generate tiny CSVs in a temp folder so they are fully self contained
 and fast. We point RATINGS_CSV at the temp file so production code runs unchanged.
 """
 
+import os
 from pathlib import Path
 import pandas as pd
 from services import ratings
@@ -105,4 +106,94 @@ def test_predict_prob_monotonic_and_margin_sign(tmp_path, monkeypatch):
 
     out_rev = ratings.predict_prob("Phoenix Suns", 2021, "Golden State Warriors", 2021)
     assert out_rev["home_win_prob"] < 0.5
-    assert out_rev["predicted_margin"] < 0
\ No newline at end of file
+    assert out_rev["predicted_margin"] < 0
+
+def test_load_full_reloads_when_csv_changes(tmp_path, monkeypatch):
+    """
+    load_full should serve the cached DataFrame while the CSV is unchanged
+    and pick up a regenerated file once its modification time moves on.
+    """
+    csv_path = make_sample_csv(tmp_path)
+    monkeypatch.setenv("RATINGS_CSV", str(csv_path))
+    importlib.reload(ratings)
+    ratings.load_full.cache_clear()
+
+    first = ratings.load_full()
+    assert ratings.load_full() is first
+
+    pd.DataFrame(
+        {
+            "GAME_DATE": pd.to_datetime(["2023-01-05"]),
+            "TEAM": ["Chicago Bulls"],
+            "RATING": [1490.0],
+        }
+    ).to_csv(csv_path, index=False)
+    stat = csv_path.stat()
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    second = ratings.load_full()
+    assert second is not first
+    assert second["TEAM"].tolist() == ["Chicago Bulls"]
+
+
+def test_get_series_filters_by_team_and_date(tmp_path, monkeypatch):
+    """
+    get_series should return date ordered rows within the inclusive
+    start/end bounds, optionally restricted to the requested teams.
+    """
+    csv_path = make_sample_csv(tmp_path)
+    monkeypatch.setenv("RATINGS_CSV", str(csv_path))
+    importlib.reload(ratings)
+    ratings.load_full.cache_clear()
+
+    out = ratings.get_series(start="2022-04-10", end="2022-12-01")
+    assert out["date"].tolist() == ["2022-04-10", "2022-12-01"]
+
+    out = ratings.get_series(teams=["Boston Celtics"], end="2022-04-10")
+    assert out.to_dict(orient="records") == [
+        {"date": "2021-10-19", "team": "Boston Celtics", "rating": 1500.0}
+    ]
+
+
+def test_get_series_skips_rows_with_unparseable_dates(tmp_path, monkeypatch):
+    """
+    A row whose GAME_DATE does not parse should be left out of the date
+    sorted series only; load_full, teams and seasons still see it as before.
+    """
+    csv_path = tmp_path / "full_ratings.csv"
+    csv_path.write_text(
+        "GAME_DATE,TEAM,RATING\n"
+        "2021-10-19,Boston Celtics,1500.0\n"
+        "not a date,Chicago Bulls,1490.0\n"
+        "2022-04-10,Los Angeles Lakers,1512.0\n"
+    )
+    monkeypatch.setenv("RATINGS_CSV", str(csv_path))
+    importlib.reload(ratings)
+    ratings.load_full.cache_clear()
+
+    assert len(ratings.load_full()) == 3
+    assert ratings.teams() == ["Boston Celtics", "Chicago Bulls", "Los Angeles Lakers"]
+    assert ratings.seasons_for_team("Boston Celtics") == [2021]
+    assert ratings.seasons_for_team("Chicago Bulls") == []
+
+    out = ratings.get_series(start="2022-01-01")
+    assert out["team"].tolist() == ["Los Angeles Lakers"]
+    assert ratings.get_series()["team"].tolist() == ["Boston Celtics", "Los Angeles Lakers"]
+
+
+def test_ratings_matrix_probs_matches_predict_prob(tmp_path, monkeypatch):
+    """
+    Each entry of the all-pairs matrix should equal the scalar home win
+    probability predict_prob reports for the same two ratings.
+    """
+    csv_path = make_sample_csv(tmp_path)
+    monkeypatch.setenv("RATINGS_CSV", str(csv_path))
+    importlib.reload(ratings)
+    ratings.load_full.cache_clear()
+
+    result = ratings.predict_prob("Boston Celtics", 2022, "Los Angeles Lakers", 2022)
+    probs = ratings.ratings_matrix_probs([result["home_rating"], result["away_rating"]])
+    assert probs.shape == (2, 2)
+    assert probs[0, 1] == pytest.approx(result["home_win_prob"])
+    assert probs[0, 1] + probs[1, 0] == pytest.approx(1.0)
+    assert probs[0, 0] == pytest.approx(0.5)
@@ -1,27 +1,160 @@
-from nba_api.stats.endpoints import leaguegamelog
+import time
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
 
 # Regular season example. Change to the season you want, format YYYY-YY
 SEASON = "2023-24"            # eg "2024-25" when that season is available
 SEASON_TYPE = "Regular Season"  # or "Playoffs"
 
-# Pull the league wide game log
-gamelog = leaguegamelog.LeagueGameLog(season=SEASON,
-                                      season_type_all_star=SEASON_TYPE)
-df = gamelog.get_data_frames()[0]
+# Raw game logs are cached on disk so re-runs skip the stats.nba.com round trip.
+# Delete the folder, or wait CACHE_MAX_AGE, to pull fresh data.
+CACHE_DIR = Path(__file__).resolve().parent / ".nba_cache"
+CACHE_MAX_AGE = 24 * 3600  # seconds; in-season logs change daily
+
+
+@lru_cache(maxsize=1)
+def _use_pooled_session():
+    """Point nba_api at one shared requests session (once per process): keep-alive
+    connections are reused across endpoint calls, and throttled or failed responses are
+    retried with backoff instead of failing the run. nba_api already asks for gzip."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    from nba_api.stats.library.http import NBAStatsHTTP
+
+    retry = Retry(total=3, backoff_factor=0.5,
+                  status_forcelist=[429, 500, 502, 503, 504], allowed_methods=["GET"])
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry))
+    NBAStatsHTTP.set_session(session)
+
+
+def _cache_path(kind, season, season_type):
+    return CACHE_DIR / f"{kind}_{season}_{season_type.replace(' ', '_')}.pkl"
+
+
+def _is_fresh(path):
+    return path.exists() and time.time() - path.stat().st_mtime < CACHE_MAX_AGE
+
+
+def load_gamelog(season, season_type):
+    """Return the league wide game log, from the disk cache when it is fresh enough."""
+    cache_path = _cache_path("gamelog", season, season_type)
+    if _is_fresh(cache_path):
+        return pd.read_pickle(cache_path)
+
+    # Only import nba_api when we actually have to hit the network
+    from nba_api.stats.endpoints import leaguegamelog
+    _use_pooled_session()
+    gamelog = leaguegamelog.LeagueGameLog(season=season,
+                                          season_type_all_star=season_type)
+    df = gamelog.get_data_frames()[0]
+    CACHE_DIR.mkdir(exist_ok=True)
+    df.to_pickle(cache_path)
+    return df
+
+
+@lru_cache(maxsize=16)
+def load_league(season, season_type):
+    """Game log prepared for build(): dates parsed, sorted, repeated strings categorical.
+    Memoized per season, so repeat calls in one process (notebooks, imports) are free;
+    treat the returned frame as read only.
+    The prepared frame is also pickled, so later runs skip the preparation as long as
+    the raw log is still fresh and neither it nor this script has changed since."""
+    raw_path = _cache_path("gamelog", season, season_type)
+    prepared_path = _cache_path("league", season, season_type)
+    if (_is_fresh(raw_path) and prepared_path.exists()
+            and prepared_path.stat().st_mtime >= max(raw_path.stat().st_mtime,
+                                                     Path(__file__).stat().st_mtime)):
+        return pd.read_pickle(prepared_path)
+
+    df = load_gamelog(season, season_type)
+
+    # LeagueGameLog dates are ISO strings; parse them once with the format given so
+    # the sort below compares datetime64 values rather than Python strings
+    df["GAME_DATE"] = pd.to_datetime(df["GAME_DATE"], format="%Y-%m-%d")
+
+    # Sort by date once; the league and team views are row subsets of it, so they
+    # come out date ordered for free. A stable sort keeps the API's order within a day.
+    df = df.sort_values("GAME_DATE", kind="stable", ignore_index=True)
+
+    # Team names, matchups and W/L repeat across rows, so store them as categoricals:
+    # smaller, and equality filters such as the team one compare small integer codes
+    for col in ("TEAM_ABBREVIATION", "TEAM_NAME", "MATCHUP", "WL"):
+        df[col] = df[col].astype("category")
+    df.to_pickle(prepared_path)
+    return df
+
+
+def build(df, team=None):
+    """Essentials plus points against for the league or one team, in df's (date) order.
+    The team filter runs first, then the output frame is assembled in one go from the
+    needed columns' arrays (no wide copy of the log, no rename pass)."""
+    sub = df if team is None else df[(df["TEAM_ABBREVIATION"] == team).to_numpy()]
+    # A partial or in progress game has no PTS/PLUS_MINUS yet; leave it out so the
+    # scores below stay plain int16 arrays
+    scored = sub["PTS"].notna().to_numpy() & sub["PLUS_MINUS"].notna().to_numpy()
+    if not scored.all():
+        sub = sub[scored]
+    # Scores and plus minus fit in int16 and NBA team ids in int32
+    pts = sub["PTS"].to_numpy(dtype=np.int16)
+    plus_minus = sub["PLUS_MINUS"].to_numpy(dtype=np.int16)
+    return pd.DataFrame({
+        "GAME_ID": sub["GAME_ID"].to_numpy(),
+        "DATE": sub["GAME_DATE"].to_numpy(),
+        "TEAM_ID": sub["TEAM_ID"].to_numpy(dtype=np.int32),
+        "TEAM_NAME": sub["TEAM_NAME"].array,
+        "TEAM_ABBREVIATION": sub["TEAM_ABBREVIATION"].array,
+        "MATCHUP": sub["MATCHUP"].array,
+        "WL": sub["WL"].array,
+        "PTS_FOR": pts,
+        "PLUS_MINUS": plus_minus,
+        "OPP_PTS": pts - plus_minus,  # points against
+    }, index=sub.index, copy=False)
+
+
+def between(frame, start, end):
+    """Rows of a date sorted frame (build() output or a team view of it) dated start..end
+    inclusive. Two binary searches and a positional slice instead of a boolean scan."""
+    dates = frame["DATE"].to_numpy()
+    lo = np.searchsorted(dates, pd.Timestamp(start).to_datetime64(), side="left")
+    hi = np.searchsorted(dates, pd.Timestamp(end).to_datetime64(), side="right")
+    return frame.iloc[lo:hi]
+
+
+def get_league(season=SEASON, season_type=SEASON_TYPE):
+    """Date ordered league frame for a season."""
+    return build(load_league(season, season_type))
+
+
+def get_team(team, season=SEASON, season_type=SEASON_TYPE):
+    """Date ordered frame for one team (by abbreviation, e.g. "BOS") without building
+    the league wide frame first; the prepared log is already sorted, so nothing re-sorts."""
+    return build(load_league(season, season_type), team=team)
+
+
+def team_frames(frame):
+    """Split a date ordered frame into {team abbreviation: that team's rows} in one
+    groupby pass; every team's rows keep the frame's date order, so none are re-sorted."""
+    return dict(tuple(frame.groupby("TEAM_ABBREVIATION", observed=True, sort=False)))
+
+
+# Only fetch and print when run as a script, so importing the helpers above is free
+if __name__ == "__main__":
+    # Pull the league wide game log
+    df = load_league(SEASON, SEASON_TYPE)
 
-# Keep the essentials and compute points against from plus minus
-out = df.loc[:, ["GAME_ID", "GAME_DATE", "TEAM_ID", "TEAM_NAME",
-                 "TEAM_ABBREVIATION", "MATCHUP", "WL", "PTS", "PLUS_MINUS"]].copy()
-out["OPP_PTS"] = out["PTS"] - out["PLUS_MINUS"]  # points against
-out = out.rename(columns={"PTS": "PTS_FOR", "GAME_DATE": "DATE"})
+    out = build(df)
 
-# Optional filter to one team, for example Boston Celtics
-team_out = out[out["TEAM_ABBREVIATION"] == "BOS"]
+    # Every team's view from one pass over the league frame, rather than one boolean
+    # scan per team; each is already in date order
+    teams = team_frames(out)
 
-# Sort by date if desired
-out = out.sort_values("DATE")
-team_out = team_out.sort_values("DATE")
+    # Optional filter to one team, for example Boston Celtics
+    team_out = teams["BOS"]
 
-print(out.head())
-print(team_out.head())
\ No newline at end of file
+    print(out.head())
+    print(team_out.head())
\ No newline at end of file